@@ -0,0 +1,7 @@
+from .en import LOCALE as en
+from .ru import LOCALE as ru
+from .fr import LOCALE as fr
+from .de import LOCALE as de
+
+# Translations of all supported languages keyed by language code
+ALL = {"en": en, "ru": ru, "fr": fr, "de": de}
@@ -1,28 +1,50 @@
 import tkinter as tk
 from tkinter import ttk
 import psutil
+import atexit
+import ctypes
 import logging
 import locale
-import importlib
 import threading
 import time
 import os
 import platform
 import subprocess
 import sqlite3
+import queue
+import select
 import random
+import re
+from collections import defaultdict
 from tkinter import Canvas
+from locales import ALL as LOCALES
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
 class TaskManagerApp:
+    BYTES_TO_GB = 1 / (1024.0 ** 3)  # Multiplier converting bytes to gigabytes
+    TRANSLATION_CACHE_SIZE = 1024  # Max formatted translations kept in memory
+    DISK_POLL_INTERVAL = 5  # Seconds between disk usage readings
+    DRIVE_POLL_INTERVAL = 30  # Seconds between removable drive checks where mounts can't be watched
+    DRIVE_POLL_JITTER = 2  # Random spread in seconds added to each removable drive check
+    # Process statuses for which the context menu offers Resume or Suspend
+    RESUMABLE_STATUSES = frozenset({psutil.STATUS_STOPPED, psutil.STATUS_TRACING_STOP})
+    SUSPENDABLE_STATUSES = frozenset({psutil.STATUS_RUNNING, psutil.STATUS_SLEEPING, psutil.STATUS_DISK_SLEEP})
+    _pattern_image = None  # Dark blue pattern shared by all calls to _create_dark_blue_pattern
+    ERROR_INSERT_ROWS = 300  # Rows per multi-row INSERT, within SQLite's 999 parameter limit
+    ERROR_ROW = "(datetime(?, 'unixepoch'), ?, ?)"  # Unix time stored in CURRENT_TIMESTAMP format
+    ERROR_INSERT = "INSERT INTO errors (timestamp, level, message) VALUES " + ERROR_ROW
+    ERROR_BULK_INSERT = ERROR_INSERT + (", " + ERROR_ROW) * (ERROR_INSERT_ROWS - 1)
+
     def __init__(self, master):
         self.master = master
+        self._err_queue = queue.Queue()  # Pending (time, level, message) rows for the error writer
         self.languages = ["en", "ru", "fr", "de"]
         self.current_language_index = 0
         self.current_locale = self._get_system_locale()
+        self._tr_cache = {}  # Formatted translations keyed by (key, kwargs)
         self.load_locale()
         
         master.title(self.translate("app_title"))
@@ -35,39 +57,97 @@ class TaskManagerApp:
         self.light_text = "#FFFFFF"  # White for text
         self.accent_color = "#4FC3F7"  # Light blue for accents
         self.process_data = {}  # Process data cache
-        self.tree_items = {}  # Store Treeview item IDs
+        self.tree_items = {}  # Treeview item ID and displayed values per PID
+        self.tree_children = {}  # Item IDs shown under each Treeview item ("" for the top level)
+        self.item_parents = {}  # Parent item ID of each attached Treeview item
+        self.processes_dirty = False  # Process data changed while the processes tab was hidden
         self.children_visible = False
-
+        self._search_after_id = None  # Pending debounced search
+        self._refresh_pending = False  # A coalesced refresh is scheduled
+        self.cpu_percent = 0.0  # Last system-wide CPU usage reading
+        self.memory_info = None  # Last virtual memory reading
+        self.disk_info = None  # Last disk usage reading
+        self.disk_checked_at = 0.0  # Monotonic time of the last disk usage reading
+        self.removable_drive_cache = (None, None)  # Mounts key and removable drive found for it
+        psutil.cpu_percent(interval=None)  # Prime the CPU counters for non-blocking reads
+        self._tick = threading.Event()  # Wakes the process worker early
+        self._stop_event = threading.Event()  # Tells worker threads to exit
 
         self._create_widgets()
-        self._create_database()  # Initialize database
+        self._error_writer = threading.Thread(target=self._error_writer_thread, daemon=True)
+        self._error_writer.start()  # Initialize database and start error log writer
         self.update_processes()  # Start process updates in a thread
         self.check_removable_drive()  # Start removable drive check
 
+        master.protocol("WM_DELETE_WINDOW", self._shutdown)  # Clean up when the window is closed
+        atexit.register(self._shutdown)
+
+    def _connect_database(self):
+        """Opens a connection to the errors database tuned for cheap commits."""
+        conn = sqlite3.connect('errors.db', isolation_level=None)  # Transactions are managed explicitly
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-8000")
+        return conn
+
     def _create_database(self):
         """Create a database connection and table."""
-        try:
-            self.conn = sqlite3.connect('errors.db')
-            self.cursor = self.conn.cursor()
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS errors (
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    level TEXT,
-                    message TEXT
-                )
-            ''')
-            self.conn.commit()
-        except sqlite3.Error as e:
-            logging.error(f"Database error: {e}")
+        conn = self._connect_database()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS errors (
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                level TEXT,
+                message TEXT
+            )
+        ''')
+        return conn
 
     def log_error_to_db(self, level, message):
-        """Log errors to the database."""
+        """Queues an error to be written to the database."""
+        err_queue = self._err_queue
+        if err_queue is not None:  # None once the database turned out to be unusable
+            err_queue.put_nowait((time.time(), level, message))  # Keep the time the error happened
+
+    def _error_writer_thread(self):
+        """Writes queued errors to the database in batches."""
         try:
-            self.cursor.execute("INSERT INTO errors (level, message) VALUES (?, ?)", (level, message))
-            self.conn.commit()
+            conn = self._create_database()  # The writer owns the app's only database connection
         except sqlite3.Error as e:
-            logging.error(f"Database logging error: {e}")
-            
+            logging.error(f"Database error: {e}")
+            self._err_queue = None  # Nothing will drain the queue, so stop filling it
+            return
+        cursor = conn.cursor()
+        while True:
+            items = [self._err_queue.get()]  # Wait for the first error
+            while True:
+                try:
+                    items.append(self._err_queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in items  # Sentinel queued by _shutdown
+            items = [item for item in items if item is not None]
+            if items:
+                try:
+                    cursor.execute("BEGIN")
+                    # Large bursts go through a multi-row INSERT, the remainder row by row
+                    rows = self.ERROR_INSERT_ROWS
+                    bulk = len(items) - len(items) % rows
+                    if bulk:
+                        cursor.executemany(self.ERROR_BULK_INSERT,
+                                           (tuple(value for item in items[i:i + rows] for value in item)
+                                            for i in range(0, bulk, rows)))
+                    cursor.executemany(self.ERROR_INSERT, items[bulk:])
+                    cursor.execute("COMMIT")
+                except sqlite3.Error as e:
+                    logging.error(f"Database logging error: {e}")
+                    if conn.in_transaction:
+                        conn.rollback()
+            if stop:
+                break
+            self._stop_event.wait(0.5)  # Let errors accumulate into the next batch
+        conn.close()
 
     def center_window(self, window):
         """Centers the tkinter window on the screen."""
@@ -89,26 +169,30 @@ class TaskManagerApp:
 
     def load_locale(self):
         """Loads translations for the current language."""
-        try:
-            module_name = f"locale_{self.current_locale}"
-            self.locale = importlib.import_module(module_name).LOCALE
-        except ModuleNotFoundError:
+        if self.current_locale not in LOCALES:
             logging.warning(f"Translation for {self.current_locale} not found. Using English.")
-            self.locale = importlib.import_module("locale_en").LOCALE
-        except Exception as e:
-            logging.error(f"Error loading locale: {e}")
-            self.log_error_to_db("ERROR", f"Error loading locale: {e}")
-            self.locale = importlib.import_module("locale_en").LOCALE
+        self.locale = LOCALES.get(self.current_locale, LOCALES["en"])
+        self._tr_cache.clear()  # Drop strings formatted in the previous language
 
     def translate(self, key, **kwargs):
         """Returns the translated string."""
+        cache_key = None  # Other arguments (e.g. exceptions) are formatted without caching
+        if all(isinstance(value, (str, int, float)) for value in kwargs.values()):
+            cache_key = (key, tuple(sorted(kwargs.items())))
+            text = self._tr_cache.get(cache_key)
+            if text is not None:
+                return text
         try:
-            text = self.locale[key]
-            return text.format(**kwargs)
+            text = self.locale[key].format(**kwargs)
         except KeyError:
             logging.error(f"Translation key '{key}' not found.")
             self.log_error_to_db("ERROR", f"Translation key '{key}' not found.")
             return key
+        if cache_key is not None:
+            if len(self._tr_cache) >= self.TRANSLATION_CACHE_SIZE:
+                self._tr_cache.clear()  # Keep changing values (CPU, memory) from growing the cache
+            self._tr_cache[cache_key] = text
+        return text
 
     def cycle_language(self):
         """Cycles through languages."""
@@ -149,6 +233,7 @@ class TaskManagerApp:
 
         self.notebook = ttk.Notebook(self.main_content_frame)
         self.notebook.pack(fill="both", expand=True, padx=10, pady=10)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
 
         self._setup_processes_tab()
         self._setup_performance_tab()
@@ -189,7 +274,7 @@ class TaskManagerApp:
 
         self.search_entry = tk.Entry(self.search_frame)
         self.search_entry.pack(side="left", padx=5)
-        self.search_entry.bind("<KeyRelease>", self.search_processes)
+        self.search_entry.bind("<KeyRelease>", self._on_search_key)
         self.search_entry.configure(bg=self.dark_blue, fg=self.light_text, insertbackground=self.light_text)
 
         # Treeview and Scrollbar
@@ -234,17 +319,17 @@ class TaskManagerApp:
                                  foreground=self.light_text)  # Original blue
 
         # Context menu (right-click menu)
+        self._update_menu_labels()
         self.context_menu = tk.Menu(self.master, tearoff=0, bg=self.dark_blue, fg=self.light_text)
-        self.context_menu.add_command(label=self.translate("kill_process_menu"),
+        self.context_menu.add_command(label=self.menu_labels["kill"],
                                       command=self.kill_selected_process, background=self.dark_blue,
                                       foreground=self.light_text)
-        self.context_menu.add_command(label=self.translate("suspend_process_menu"),
-                                      command=self.suspend_selected_process, background=self.dark_blue,
-                                      foreground=self.light_text)
-        self.context_menu.add_command(label=self.translate("resume_process_menu"),
-                                      command=self.resume_selected_process, background=self.dark_blue,
+        self.context_menu.add_command(label=self.menu_labels["suspend"],
+                                      command=self._suspend_or_resume_selected, background=self.dark_blue,
                                       foreground=self.light_text)
-        self.context_menu.add_command(label=self.translate("open_file_location_menu"),
+        self.suspend_menu_index = self.context_menu.index(tk.END)  # Suspend/Resume entry, set per click
+        self._menu_resumes = False  # Whether that entry currently reads "Resume"
+        self.context_menu.add_command(label=self.menu_labels["open_file_location"],
                                       command=self.open_file_location, background=self.dark_blue,
                                       foreground=self.light_text)
 
@@ -257,10 +342,19 @@ class TaskManagerApp:
         self.button_frame.configure(bg=self.dark_blue)
 
         self.refresh_button = tk.Button(self.button_frame, text=self.translate("refresh_button"),
-                                         command=self.refresh_processes)
+                                         command=self.request_process_update)
         self.refresh_button.pack(side="left", padx=5)
         self.refresh_button.configure(bg=self.dark_blue, fg=self.light_text)
 
+    def _update_menu_labels(self):
+        """Translates the context menu labels for the current language."""
+        self.menu_labels = {
+            "kill": self.translate("kill_process_menu"),
+            "suspend": self.translate("suspend_process_menu"),
+            "resume": self.translate("resume_process_menu"),
+            "open_file_location": self.translate("open_file_location_menu"),
+        }
+
     def _setup_performance_tab(self):
         """Sets up the performance tab with machine sensor simulation."""
         self.performance_tab = tk.Frame(self.notebook)
@@ -500,15 +594,13 @@ class TaskManagerApp:
         self.tree.heading("Память (МБ)", text=self.translate("memory_column"))
         self.tree.heading("родительский PID", text=self.translate("ppid_column"))
 
-        self.cpu_label.config(text=self.translate("cpu_label", cpu_percent=psutil.cpu_percent(interval=1)))
-        memory = psutil.virtual_memory()
-        self.memory_label.config(
-            text=self.translate("memory_label", memory_percent=memory.percent, memory_used_gb=round(memory.used / (1024.0 ** 3), 1),
-                               memory_total_gb=round(memory.total / (1024.0 ** 3), 1)))
-        disk = psutil.disk_usage('/')
-        self.disk_label.config(
-            text=self.translate("disk_label", disk_percent=disk.percent, disk_used_gb=round(disk.used / (1024.0 ** 3), 1),
-                               disk_total_gb=round(disk.total / (1024.0 ** 3), 1)))
+        self._update_menu_labels()
+        self.context_menu.entryconfigure(0, label=self.menu_labels["kill"])
+        self.context_menu.entryconfigure(self.suspend_menu_index, label=self.menu_labels["suspend"])
+        self.context_menu.entryconfigure(tk.END, label=self.menu_labels["open_file_location"])
+
+        if self.disk_info is not None:  # Relabel the last readings once the first one is taken
+            self._apply_sysinfo(self.cpu_percent, self.memory_info, self.disk_info)
         self.removable_drive_label.config(
             text=self.translate("removable_drive_status", status=self.removable_drive_label.cget('text').split(':')[-1]))
 
@@ -517,49 +609,77 @@ class TaskManagerApp:
             self.language_button.config(text=self.current_locale.upper())
 
     def update_system_info(self):
-        """Updates system information."""
+        """Starts the worker thread that updates system information."""
+        threading.Thread(target=self._system_info_loop, daemon=True).start()
+
+    def _system_info_loop(self):
+        """Updates system information every second until the app stops."""
+        while True:
+            self._update_system_info_thread()
+            if self._stop_event.wait(1.0):
+                break
+
+    def _update_system_info_thread(self):
+        """Gets system information in a separate thread."""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            memory_percent = memory.percent
-            memory_total_gb = round(memory.total / (1024.0 ** 3), 1)
-            memory_used_gb = round(memory.used / (1024.0 ** 3), 1)
-
-            disk = psutil.disk_usage('/')
-            disk_percent = disk.percent
-            disk_total_gb = round(disk.total / (1024.0 ** 3), 1)
-            disk_used_gb = round(disk.used / (1024.0 ** 3), 1)
-
-            self.master.after(0, lambda: self.cpu_label.config(text=self.translate("cpu_label", cpu_percent=cpu_percent)))
-            self.master.after(0,
-                               lambda: self.memory_label.config(
-                                   text=self.translate("memory_label", memory_percent=memory_percent,
-                                                       memory_used_gb=memory_used_gb,
-                                                       memory_total_gb=memory_total_gb)))
-            self.master.after(0,
-                               lambda: self.disk_label.config(
-                                   text=self.translate("disk_label", disk_percent=disk_percent, disk_used_gb=disk_used_gb,
-                                                       disk_total_gb=disk_total_gb)))
-
-            self.master.after(1000, self.update_system_info)
+            self.cpu_percent = psutil.cpu_percent(interval=None)  # Usage since the previous tick
+            self.memory_info = psutil.virtual_memory()
+            if self.disk_info is None or time.monotonic() - self.disk_checked_at >= self.DISK_POLL_INTERVAL:
+                self.disk_info = psutil.disk_usage('/')
+                self.disk_checked_at = time.monotonic()
+
+            # Single UI update; the labels are translated on the Tk thread
+            self.master.after(0, self._apply_sysinfo, self.cpu_percent, self.memory_info, self.disk_info)
         except Exception as e:
+            if self._stop_event.is_set():
+                return  # The window was destroyed during shutdown
             logging.error(f"Error updating system info: {e}")
             self.log_error_to_db("ERROR", f"Error updating system info: {e}")
 
+    def _apply_sysinfo(self, cpu_percent, memory, disk):
+        """Updates the CPU, memory and disk labels."""
+        cpu_text = self.translate("cpu_label", cpu_percent=cpu_percent)
+        memory_text = self.translate("memory_label", memory_percent=memory.percent,
+                                     memory_used_gb=round(memory.used * self.BYTES_TO_GB, 1),
+                                     memory_total_gb=round(memory.total * self.BYTES_TO_GB, 1))
+        disk_text = self.translate("disk_label", disk_percent=disk.percent,
+                                   disk_used_gb=round(disk.used * self.BYTES_TO_GB, 1),
+                                   disk_total_gb=round(disk.total * self.BYTES_TO_GB, 1))
+        self.cpu_label.config(text=cpu_text)
+        self.memory_label.config(text=memory_text)
+        self.disk_label.config(text=disk_text)
+
     def update_processes(self):
-        """Updates process information."""
-        threading.Thread(target=self._update_processes_thread, daemon=True).start()
+        """Starts the worker thread that updates process information."""
+        threading.Thread(target=self._process_loop, daemon=True).start()
+
+    def _process_loop(self):
+        """Updates process information every 2 seconds until the app stops."""
+        while not self._stop_event.is_set():
+            self._update_processes_thread()
+            self._tick.wait(2.0)
+            self._tick.clear()
+
+    def request_process_update(self):
+        """Wakes the process worker for an immediate update."""
+        self._tick.set()
 
     def _update_processes_thread(self):
         """Gets process information in a separate thread."""
         try:
             start_time = time.time()
             processes = []
-            for process in psutil.process_iter(
-                    ['pid', 'name', 'status', 'cpu_percent', 'memory_info', 'ppid']):  # Added 'cpu_percent'
+            # process_iter() yields the same Process instance for a PID on every
+            # sweep, so cpu_percent() without an interval returns the usage since
+            # the previous sweep. oneshot() lets it share the /proc reads made for
+            # the other attributes.
+            for process in psutil.process_iter():
                 try:
-                    processes.append(process.as_dict(
-                        ['pid', 'name', 'status', 'cpu_percent', 'memory_info', 'ppid']))  # Added 'cpu_percent'
+                    with process.oneshot():
+                        info = process.as_dict(['pid', 'name', 'status', 'memory_info', 'ppid'])
+                        info['cpu_percent'] = process.cpu_percent(interval=None)
+                    info['process_obj'] = process
+                    processes.append(info)
                 except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess) as e:
                     logging.warning(f"Failed to get process {e}")
                     self.log_error_to_db("WARNING", f"Failed to get process {e}")
@@ -567,10 +687,11 @@ class TaskManagerApp:
             end_time = time.time()
             logging.debug(f"Getting process data took: {end_time - start_time:.4f} seconds")
 
-            self.master.after(0, lambda: self.process_data_update(processes))
-            self.master.after(2000, self.update_processes)  # Re-schedules itself
+            self.master.after(0, self.process_data_update, processes)
 
         except Exception as e:
+            if self._stop_event.is_set():
+                return  # The window was destroyed during shutdown
             logging.error(f"Error getting process list: {e}")
             self.log_error_to_db("ERROR", f"Error getting process list: {e}")
 
@@ -584,10 +705,10 @@ class TaskManagerApp:
                 new_process_data[pid] = {
                     'name': process['name'],
                     'status': process['status'],
-                    'cpu_percent': process['cpu_percent'],  # Store CPU usage
-                    'memory_mb': process['memory_info'].rss / (1024 * 1024),
+                    'cpu_tenths': round(process['cpu_percent'] * 10),  # CPU usage in tenths of a percent
+                    'memory_tenths': round(process['memory_info'].rss * 10 / (1024 * 1024)),  # Memory in tenths of MB
                     'ppid': process['ppid'],
-                    'process_obj': psutil.Process(pid)
+                    'process_obj': process['process_obj']  # Instance cached by process_iter()
                 }
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess) as e:
                 logging.warning(f"Failed to get data about process with PID {process['pid']}: {e}")
@@ -601,52 +722,166 @@ class TaskManagerApp:
         self.process_data = new_process_data
         end_time = time.time()
         logging.debug(f"Processing process data took: {end_time - start_time:.4f} seconds")
-        self.master.after(0, self.refresh_processes)
+        if self._processes_tab_visible():
+            self.master.after(0, self.refresh_processes)
+        else:
+            self.processes_dirty = True  # Refresh when the tab is shown again
+
+    def _processes_tab_visible(self):
+        """Checks whether the processes tab is the selected notebook page."""
+        return self.notebook.select() == str(self.processes_tab)
+
+    def _on_tab_changed(self, event):
+        """Refreshes the processes tab if its data changed while it was hidden."""
+        if self.processes_dirty and self._processes_tab_visible():
+            self.refresh_processes()
 
     def refresh_processes(self):
         """Refreshes the process display in Treeview."""
         start_time = time.time()
+        self.processes_dirty = False
         self.search_processes()
         end_time = time.time()
         logging.debug(f"Refreshing Treeview took: {end_time - start_time:.4f} seconds")
 
+    def _on_search_key(self, event):
+        """Runs the search once typing pauses for 150 ms."""
+        if self._search_after_id:
+            self.master.after_cancel(self._search_after_id)
+        self._search_after_id = self.master.after(150, self._do_search)
+
+    def _do_search(self):
+        """Runs the search scheduled by _on_search_key."""
+        self._search_after_id = None
+        self.search_processes()
+
     def search_processes(self, event=None):
         """Performs process search."""
-        search_term = self.search_entry.get().lower()
+        if self.tree_items:
+            self._sync_treeview()
+            return
 
-        # Clear Treeview and reset ID dictionary
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        self.tree_items = {}
+        # First fill: hide the columns so Tk skips layout while all rows are inserted
+        self.tree.configure(displaycolumns=())
+        try:
+            self._sync_treeview()
+        finally:
+            self.tree.configure(displaycolumns="#all")
+        self.tree.update_idletasks()
 
-        for pid, process_info in self.process_data.items():
-            if search_term in process_info['name'].lower():
-                self._insert_process_to_treeview(pid, process_info)
+    def _sync_treeview(self):
+        """Brings the Treeview rows in line with the process data and search term."""
+        search_term = self.search_entry.get().lower()
+        matches = {pid for pid, process_info in self.process_data.items()
+                   if search_term in process_info['name'].lower()}
 
-    def _insert_process_to_treeview(self, pid, process_info):
-        """Adds a process to Treeview."""
-        try:
+        # Split matching processes into top-level rows and children of shown parents.
+        # Rows not placed anywhere (filtered out or hidden children) end up detached.
+        roots = []
+        children_by_ppid = defaultdict(list)
+        for pid, process_info in self.process_data.items():
             ppid = process_info['ppid']
-            values = (pid, process_info['name'], process_info['status'],
-                      f"{process_info['cpu_percent']:.1f}",  # Display CPU usage
-                      f"{process_info['memory_mb']:.1f}", ppid)
-
-            if ppid == 0 or ppid not in self.process_data:
-                item_id = self.tree.insert("", "end", values=values)
-                self.tree_items[pid] = item_id
+            if pid not in matches:
+                continue
+            elif ppid in (0, None) or ppid not in self.process_data:
+                roots.append(pid)
+            elif not self.children_visible:
+                continue
+            elif ppid in matches:
+                children_by_ppid[ppid].append(pid)
             else:
-                if self.children_visible:
-                    parent_id = ppid
-                    if parent_id in self.tree_items:
-                        self.tree.insert(self.tree_items[parent_id], "end", values=values)
-                    else:
-                        item_id = self.tree.insert("", "end", values=values)
-                        self.tree_items[pid] = item_id
+                roots.append(pid)
+
+        # Walk the hierarchy so every parent row exists before its children, collecting
+        # the rows each parent should show in process order.
+        # Processes left unvisited (PID reuse cycles) are shown as top-level rows.
+        shown_children = {"": []}
+        shown_parents = [""]
+        order = {pid: index for index, pid in enumerate(self.process_data)}
+        positions = {}  # Position in process_data of each shown row
+        inserted = set()
+        for root_pid in roots + [pid for pids in children_by_ppid.values() for pid in pids]:
+            if root_pid in inserted:
+                continue
+            stack = [(root_pid, "")]
+            while stack:
+                pid, parent = stack.pop()
+                inserted.add(pid)
+                item_id = self._insert_process_to_treeview(pid, self.process_data[pid], parent)
+                if item_id is None:
+                    item_id = ""  # Show the children of a failed row as top-level rows
+                else:
+                    positions[item_id] = order[pid]
+                    shown_children[parent].append(item_id)
+                    shown_children[item_id] = []
+                    shown_parents.append(item_id)
+                stack.extend((child_pid, item_id) for child_pid in reversed(children_by_ppid.get(pid, ()))
+                             if child_pid not in inserted)
+
+        # Cycle leftovers and children of failed rows were appended to the top level
+        # after the walk from the roots; put them in process order too
+        shown_children[""].sort(key=positions.__getitem__)
+
+        # Reorder, reparent, reattach and hide rows with one Tk call per changed parent
+        for parent in shown_parents:
+            if shown_children[parent] != self.tree_children.get(parent, []):
+                self._set_treeview_children(parent, shown_children[parent])
+
+        # Remove rows of processes that no longer exist in a single Tk call
+        dead_items = []
+        for pid in [pid for pid in self.tree_items if pid not in self.process_data]:
+            item_id, _ = self.tree_items.pop(pid)
+            if self.tree_children.get(item_id):
+                self._set_treeview_children(item_id, [])  # Keep hidden children alive
+            self.tree_children.pop(item_id, None)
+            parent = self.item_parents.pop(item_id, None)
+            if parent is not None:
+                self.tree_children[parent].remove(item_id)
+            dead_items.append(item_id)
+        if dead_items:
+            self.tree.delete(*dead_items)
+
+    def _insert_process_to_treeview(self, pid, process_info, parent=""):
+        """Adds a process to Treeview or updates its existing row and returns its item ID."""
+        try:
+            values = (pid, process_info['name'], process_info['status'],
+                      process_info['cpu_tenths'], process_info['memory_tenths'], process_info['ppid'])
+
+            if pid not in self.tree_items:
+                item_id = self.tree.insert(parent, "end", values=self._format_process_values(values))
+                self.tree_items[pid] = (item_id, values)
+                self.tree_children.setdefault(parent, []).append(item_id)
+                self.item_parents[item_id] = parent
+                return item_id
+
+            # Unchanged rows are neither formatted nor sent to Tk
+            item_id, old_values = self.tree_items[pid]
+            if values != old_values:
+                self.tree.item(item_id, values=self._format_process_values(values))
+                self.tree_items[pid] = (item_id, values)
+            return item_id
 
         except Exception as e:
             logging.error(f"Error adding process with PID {pid} to Treeview: {e}")
             self.log_error_to_db("ERROR", f"Error adding process with PID {pid} to Treeview: {e}")
 
+    def _set_treeview_children(self, parent, children):
+        """Makes children the rows under parent, in order, detaching the rows left out."""
+        self.tree.set_children(parent, *children)
+        for item_id in self.tree_children.get(parent, ()):
+            self.item_parents.pop(item_id, None)  # Detached unless listed again below
+        for item_id in children:
+            old_parent = self.item_parents.get(item_id)
+            if old_parent is not None:
+                self.tree_children[old_parent].remove(item_id)  # Tk moved it away from there
+            self.item_parents[item_id] = parent
+        self.tree_children[parent] = list(children)
+
+    def _format_process_values(self, values):
+        """Formats a process row for display in Treeview."""
+        pid, name, status, cpu_tenths, memory_tenths, ppid = values
+        return pid, name, status, f"{cpu_tenths / 10:.1f}", f"{memory_tenths / 10:.1f}", ppid
+
     def kill_selected_process(self):
         """Kills the selected process."""
         try:
@@ -686,7 +921,9 @@ class TaskManagerApp:
                 process = self.process_data[pid]['process_obj']
                 process.suspend()
                 logging.info(f"Process with PID {pid} suspended.")
+                self.process_data[pid]['status'] = psutil.STATUS_STOPPED  # Menu offers Resume right away
                 self.refresh_processes()
+                self.request_process_update()
             else:
                 logging.warning(f"Process with PID {pid} not found.")
                 self.log_error_to_db("WARNING", f"Process with PID {pid} not found.")
@@ -715,7 +952,9 @@ class TaskManagerApp:
                 process = self.process_data[pid]['process_obj']
                 process.resume()
                 logging.info(f"Process with PID {pid} resumed.")
+                self.process_data[pid]['status'] = psutil.STATUS_RUNNING  # Menu offers Suspend right away
                 self.refresh_processes()
+                self.request_process_update()
             else:
                 logging.warning(f"Process with PID {pid} not found.")
                 self.log_error_to_db("WARNING", f"Process with PID {pid} not found.")
@@ -745,9 +984,10 @@ class TaskManagerApp:
                     process = self.process_data[pid]['process_obj']
                     exe_path = process.exe()
 
-                    if platform.system() == "Windows":
+                    system = platform.system()
+                    if system == "Windows":
                         os.startfile(os.path.dirname(exe_path))  # Open folder in Windows
-                    elif platform.system() == "Linux" or platform.system() == "Darwin":  # macOS is Darwin
+                    elif system == "Linux" or system == "Darwin":  # macOS is Darwin
                         subprocess.run(["xdg-open", os.path.dirname(exe_path)])  # Open folder in Linux/macOS
                     else:
                         logging.warning("Opening folder not supported on this OS.")
@@ -774,37 +1014,39 @@ class TaskManagerApp:
 
     def show_context_menu(self, event):
         """Shows the context menu on a right-click."""
+        row = self.tree.identify_row(event.y)
+        if not row:
+            return  # Clicked outside a row
         try:
-            self.tree.selection_set(self.tree.identify_row(event.y))  # Select the clicked row
+            self.tree.selection_set(row)  # Select the clicked row
             # Get PID of the selected process
-            selected_item = self.tree.selection()[0]
-            pid = int(self.tree.item(selected_item, "values")[0])
-            # Update context menu depending on process status
-            self.context_menu.delete(0, tk.END)  # Clear existing items
-            self.context_menu.add_command(label=self.translate("kill_process_menu"),
-                                          command=self.kill_selected_process, background=self.dark_blue,
-                                          foreground=self.light_text)
-            if pid in self.process_data:
-                process = self.process_data[pid]['process_obj']
-                if process.status() == psutil.STATUS_RUNNING:
-                    self.context_menu.add_command(label=self.translate("suspend_process_menu"),
-                                                  command=self.suspend_selected_process, background=self.dark_blue,
-                                                  foreground=self.light_text)
-                elif process.status() == psutil.STATUS_STOPPED:
-                    self.context_menu.add_command(label=self.translate("resume_process_menu"),
-                                                  command=self.resume_selected_process, background=self.dark_blue,
-                                                  foreground=self.light_text)
-            self.context_menu.add_command(label=self.translate("open_file_location_menu"),
-                                          command=self.open_file_location, background=self.dark_blue,
-                                          foreground=self.light_text)
-            self.context_menu.post(event.x_root, event.y_root)  # Show menu
+            pid = int(self.tree.item(row, "values")[0])
+            # Switch between suspend and resume depending on the status from the last refresh
+            status = self.process_data[pid]['status'] if pid in self.process_data else None
+            self._menu_resumes = status in self.RESUMABLE_STATUSES
+            if self._menu_resumes:
+                self.context_menu.entryconfigure(self.suspend_menu_index, state="normal",
+                                                 label=self.menu_labels["resume"])
+            else:
+                self.context_menu.entryconfigure(self.suspend_menu_index,
+                                                 state="normal" if status in self.SUSPENDABLE_STATUSES else "disabled",
+                                                 label=self.menu_labels["suspend"])
+            try:
+                self.context_menu.tk_popup(event.x_root, event.y_root)  # Show menu
+            finally:
+                self.context_menu.grab_release()  # Don't keep the pointer grabbed after the menu closes
 
-        except IndexError:
-            pass  # Clicked outside a row
         except Exception as e:
             logging.error(f"Error showing context menu: {e}")
             self.log_error_to_db("ERROR", f"Error showing context menu: {e}")
 
+    def _suspend_or_resume_selected(self):
+        """Runs whichever of suspend/resume the context menu entry was last set to."""
+        if self._menu_resumes:
+            self.resume_selected_process()
+        else:
+            self.suspend_selected_process()
+
     def toggle_children(self):
         """Toggles the visibility of child processes."""
         self.children_visible = not self.children_visible
@@ -812,54 +1054,147 @@ class TaskManagerApp:
             self.toggle_children_button.config(text=self.translate("toggle_children_button_hide"))
         else:
             self.toggle_children_button.config(text=self.translate("toggle_children_button_show"))
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        """Refreshes the process display once Tk is idle, coalescing repeated requests."""
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        self.master.after_idle(self._do_refresh)
+
+    def _do_refresh(self):
+        """Runs the refresh scheduled by _schedule_refresh."""
+        self._refresh_pending = False
         self.refresh_processes()
 
     def check_removable_drive(self):
-        """Checks for the presence of a removable drive (USB drive)."""
-        threading.Thread(target=self._check_removable_drive_thread, daemon=True).start()
+        """Starts checking for the presence of a removable drive (USB drive)."""
+        if platform.system() == "Linux":
+            target = self._watch_mounts_thread
+        else:
+            target = self._check_removable_drive_thread
+        threading.Thread(target=target, daemon=True).start()
 
     def _check_removable_drive_thread(self):
-        """Executes the removable drive check in a separate thread."""
+        """Checks for a removable drive every 30 seconds until the app stops."""
+        while True:
+            self._update_removable_drive_status()
+            # Jittered so the check doesn't keep landing on a process refresh
+            delay = self.DRIVE_POLL_INTERVAL + random.uniform(-self.DRIVE_POLL_JITTER, self.DRIVE_POLL_JITTER)
+            if self._stop_event.wait(delay):
+                break
+
+    def _watch_mounts_thread(self):
+        """Checks for a removable drive whenever the mount table changes (Linux)."""
+        try:
+            with open('/proc/self/mounts', 'rb') as mounts:
+                poller = select.poll()
+                poller.register(mounts, select.POLLPRI | select.POLLERR)  # Signalled on mount/unmount
+                self._update_removable_drive_status(mounts.read())
+                while not self._stop_event.is_set():
+                    # Each poll reports a change once and re-arms the notification;
+                    # the timeout lets the loop notice the stop event.
+                    if poller.poll(1000):
+                        mounts.seek(0)
+                        self._update_removable_drive_status(mounts.read())
+        except OSError as e:
+            logging.warning(f"Cannot watch mount table, polling instead: {e}")
+            self.log_error_to_db("WARNING", f"Cannot watch mount table, polling instead: {e}")
+            self._check_removable_drive_thread()
+
+    def _update_removable_drive_status(self, mount_table=None):
+        """Finds a removable drive and schedules a label update."""
         try:
-            removable_drive = self._find_removable_drive()
+            removable_drive = self._find_removable_drive(mount_table)
             if removable_drive:
-                self.master.after(0, lambda: self.removable_drive_label.config(
-                    text=self.translate("removable_drive_status", status=f"Detected: {removable_drive}")))
+                status = f"Detected: {removable_drive}"
             else:
-                self.master.after(0, lambda: self.removable_drive_label.config(
-                    text=self.translate("removable_drive_status", status="Not detected")))
+                status = "Not detected"
         except Exception as e:
+            if self._stop_event.is_set():
+                return  # The window was destroyed during shutdown
             logging.error(f"Error checking removable drive: {e}")
             self.log_error_to_db("ERROR", f"Error checking removable drive: {e}")
-            self.master.after(0, lambda: self.removable_drive_label.config(
-                text=self.translate("removable_drive_status", status="Error")))
-
-        self.master.after(5000, self.check_removable_drive)  # Check every 5 seconds
+            status = "Error"
+        try:
+            self.master.after(0, self._set_removable_drive_status, status)
+        except Exception as e:
+            if self._stop_event.is_set():
+                return  # The window was destroyed during shutdown
+            logging.error(f"Error updating removable drive status: {e}")
+            self.log_error_to_db("ERROR", f"Error updating removable drive status: {e}")
+
+    def _set_removable_drive_status(self, status):
+        """Updates the removable drive label."""
+        self.removable_drive_label.config(text=self.translate("removable_drive_status", status=status))
+
+    def _mounts_key(self):
+        """Returns a value that changes when drives are mounted, or None if unknown."""
+        system = platform.system()
+        if system == "Windows":
+            return ctypes.windll.kernel32.GetLogicalDrives()  # Bitmask of drive letters in use
+        if system == "Darwin":
+            return os.stat('/Volumes').st_mtime_ns  # Volumes are mounted under /Volumes
+        return None
 
-    def _find_removable_drive(self):
+    def _find_removable_drive(self, mount_table=None):
         """Finds a mounted removable disk."""
+        if platform.system() == "Linux":
+            if mount_table is None:
+                with open('/proc/self/mounts', 'rb', buffering=0) as mounts:
+                    mount_table = mounts.read()
+            return self._find_removable_mountpoint(mount_table)
+
+        mounts_key = self._mounts_key()
+        if mounts_key is not None and self.removable_drive_cache[0] == mounts_key:
+            return self.removable_drive_cache[1]
+
+        removable_drive = None
         for partition in psutil.disk_partitions():
             if 'removable' in partition.opts:
-                return partition.mountpoint
+                removable_drive = partition.mountpoint
+                break
+        if mounts_key is not None:
+            self.removable_drive_cache = (mounts_key, removable_drive)
+        return removable_drive
+
+    def _find_removable_mountpoint(self, mount_table):
+        """Finds a removable disk in the contents of /proc/self/mounts (Linux)."""
+        for line in mount_table.splitlines():
+            fields = line.split()
+            if len(fields) > 1 and fields[1].startswith((b'/media/', b'/run/media/')):
+                # Spaces and other special characters are escaped as \ooo octal sequences
+                mountpoint = re.sub(rb'\\([0-7]{3})', lambda match: bytes([int(match.group(1), 8)]), fields[1])
+                return os.fsdecode(mountpoint)
         return None
 
     def _create_dark_blue_pattern(self):
-        """Creates a dark blue pattern as an image."""
-        # Create a pattern image (can be replaced with a more complex one)
-        pattern_image = tk.PhotoImage(width=2, height=2)
-        pattern_image.put("#222233", to=(0, 0, 1, 1))  # Darker shade
-        pattern_image.put("#1E1E2E", to=(0, 1, 1, 0))  # Original dark blue
+        """Creates a dark blue pattern as an image, built once and then reused."""
+        pattern_image = TaskManagerApp._pattern_image
+        if pattern_image is None:
+            # Create a pattern image (can be replaced with a more complex one)
+            pattern_image = tk.PhotoImage(width=2, height=2)
+            pattern_image.put("#222233", to=(0, 0, 1, 1))  # Darker shade
+            pattern_image.put("#1E1E2E", to=(0, 1, 1, 0))  # Original dark blue
+            TaskManagerApp._pattern_image = pattern_image
 
         return pattern_image
 
-    def __del__(self):
-        """Close database connection when the object is destroyed."""
+    def _shutdown(self):
+        """Stops background threads and closes the window."""
+        if self._stop_event.is_set():
+            return  # Already shut down
+        self._stop_event.set()
+        self._tick.set()  # Wake the process worker so it can exit
+        err_queue = self._err_queue
+        if err_queue is not None:
+            err_queue.put(None)  # Let the error writer flush pending errors and exit
+        self._error_writer.join(timeout=2)
         try:
-            if hasattr(self, 'conn'):  # Check if the connection exists
-                self.conn.close()
-        except Exception as e:
-            logging.error(f"Error closing database connection: {e}")
-            self.log_error_to_db("ERROR", f"Error closing database connection: {e}")
+            self.master.destroy()
+        except tk.TclError:
+            pass  # Window already destroyed
 
 root = tk.Tk()
 app = TaskManagerApp(root)